@@ -1,42 +1,91 @@
 from django.contrib import admin
+from django.db.models import BooleanField, ExpressionWrapper, F, Q, Sum
 from django.utils.html import format_html
 from .models import Customer, Price, Stock, StockRecord, Transaction, AuditLog
 
 @admin.register(Customer)
 class CustomerAdmin(admin.ModelAdmin):
-    list_display = ['full_name', 'nickname', 'phone_number', 'date_created']
+    list_display = ['full_name', 'nickname', 'phone_number', 'total_purchases', 'date_created']
     search_fields = ['full_name', 'nickname', 'phone_number']
     list_filter = ['date_created']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _total_purchases=Sum('transaction__total_amount')
+        )
+
+    def total_purchases(self, obj):
+        return obj.total_purchases()
+    total_purchases.short_description = 'Total Purchases'
+    total_purchases.admin_order_field = '_total_purchases'
+
 @admin.register(Price)
 class PriceAdmin(admin.ModelAdmin):
     list_display = ['category', 'price', 'date_updated', 'updated_by']
+    # list_editable binds a form per row; fine for one row per egg category,
+    # drop it in favour of the change form if categories ever grow
     list_editable = ['price']
+    list_per_page = 25
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('updated_by')
+
+class LowStockFilter(admin.SimpleListFilter):
+    title = 'status'
+    parameter_name = 'low_stock'
+
+    def lookups(self, request, model_admin):
+        return [('yes', 'Low Stock'), ('no', 'Good')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(_low=True)
+        if self.value() == 'no':
+            return queryset.filter(_low=False)
+        return queryset
 
 @admin.register(Stock)
 class StockAdmin(admin.ModelAdmin):
     list_display = ['category', 'quantity', 'low_stock_threshold', 'last_updated', 'stock_status']
+    # Same per-row form cost as PriceAdmin.list_editable, bounded by the categories
     list_editable = ['low_stock_threshold']
+    list_per_page = 25
+    list_filter = [LowStockFilter]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _low=ExpressionWrapper(Q(quantity__lt=F('low_stock_threshold')), output_field=BooleanField())
+        )
 
     def stock_status(self, obj):
-        if obj.is_low_stock():
+        if obj._low:
             return format_html('<span style="color: red;">⚠️ Low Stock</span>')
         return format_html('<span style="color: green;">✓ Good</span>')
     stock_status.short_description = 'Status'
+    stock_status.admin_order_field = '_low'
 
 @admin.register(StockRecord)
 class StockRecordAdmin(admin.ModelAdmin):
     list_display = ['category', 'quantity_added', 'date_recorded', 'recorded_by']
     list_filter = ['category', 'date_recorded']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('recorded_by')
+
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
     list_display = ['invoice_number', 'customer', 'egg_category', 'quantity', 'total_amount', 'transaction_date']
     list_filter = ['egg_category', 'transaction_date']
     search_fields = ['invoice_number', 'customer__full_name']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('customer')
+
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ['timestamp', 'user', 'action', 'model_name']
     list_filter = ['action', 'timestamp']
-    readonly_fields = ['details']
\ No newline at end of file
+    readonly_fields = ['details']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
\ No newline at end of file
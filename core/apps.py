@@ -1,5 +1,53 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
 from django.apps import AppConfig
 
 
+class ProcessQueueHandler(QueueHandler):
+    """QueueHandler whose listener runs in whichever process emits the records
+
+    A listener thread started before a fork (e.g. gunicorn --preload) only
+    exists in the parent, so each process starts its own on first use.
+    """
+
+    def __init__(self, handlers):
+        super().__init__(queue.SimpleQueue())
+        self.target_handlers = handlers
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().enqueue(record)
+
+    def _start_listener(self):
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            # A forked child gets a copy of the parent's queue; start from a fresh one
+            if self._listener_pid is not None:
+                self.queue = queue.SimpleQueue()
+            listener = QueueListener(self.queue, *self.target_handlers, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+            self._listener_pid = os.getpid()
+
+
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        # Route core log records through a queue so file/network handlers
+        # configured in LOGGING run on a background thread, not the request
+        logger = logging.getLogger(self.name)
+        if not logger.handlers or any(isinstance(h, QueueHandler) for h in logger.handlers):
+            return
+        logger.handlers = [ProcessQueueHandler(logger.handlers)]
@@ -0,0 +1,116 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.db import connection
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Background thread that bulk inserts queued audit entries"""
+
+    flush_interval = 2
+    batch_size = 100
+    # SQLite reports "database is locked" while another writer holds it
+    max_attempts = 3
+    retry_delay = 0.5
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def submit(self, entries):
+        for entry in entries:
+            self._queue.put(entry)
+        self._ensure_started()
+
+    def stop(self, timeout=5):
+        """Write whatever is still queued and stop the thread"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            entries = [self._queue.get()]
+            # Coalesce whatever arrives within the flush window into one insert
+            deadline = time.monotonic() + self.flush_interval
+            while entries[-1] is not _STOP and len(entries) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entries.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            stopping = entries[-1] is _STOP
+            self._write([entry for entry in entries if entry is not _STOP])
+            if stopping:
+                return
+
+    def _write(self, entries):
+        if not entries:
+            return
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    AuditLog.objects.bulk_create(entries, batch_size=self.batch_size)
+                    return
+                except Exception:
+                    if attempt == self.max_attempts:
+                        logger.warning("Bulk audit write failed, saving %d entries one by one", len(entries))
+                    else:
+                        time.sleep(self.retry_delay * attempt)
+            # Fall back to individual saves so one bad entry doesn't lose the batch
+            for entry in entries:
+                try:
+                    entry.save()
+                except Exception:
+                    logger.exception("Failed to write audit log entry: %s %s", entry.action, entry.model_name)
+        finally:
+            connection.close()
+
+
+audit_writer = AuditWriter()
+
+
+def log_audit(request, **kwargs):
+    """Queue an audit entry to be written after the response is returned"""
+    entry = AuditLog(**kwargs)
+    buffer = getattr(request, '_audit_buffer', None)
+    if buffer is None:
+        # Middleware not installed (e.g. called outside a request cycle)
+        entry.save()
+    else:
+        buffer.append(entry)
+
+
+class AuditBufferMiddleware:
+    """Collect audit entries per request and hand them to the background writer"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._audit_buffer = []
+        response = self.get_response(request)
+        if request._audit_buffer:
+            audit_writer.submit(request._audit_buffer)
+        return response
@@ -1,7 +1,8 @@
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm
-from .models import Customer, Price, Stock, Transaction, StockRecord
+from .models import Customer, Price, Stock, Transaction, StockRecord, EggCategory
 from django.core.exceptions import ValidationError
+from django.db.models import OuterRef, Subquery
 from decimal import Decimal
 
 class LoginForm(AuthenticationForm):
@@ -28,13 +29,7 @@ class PriceForm(forms.ModelForm):
         }
 
 class StockRecordForm(forms.Form):
-    CATEGORY_CHOICES = [
-        ('SMALL', 'Small Eggs'),
-        ('MEDIUM', 'Medium Eggs'),
-        ('LARGE', 'Large Eggs'),
-    ]
-
-    category = forms.ChoiceField(choices=CATEGORY_CHOICES, widget=forms.Select(attrs={'class': 'form-control'}))
+    category = forms.ChoiceField(choices=EggCategory.choices, widget=forms.Select(attrs={'class': 'form-control'}))
     quantity = forms.IntegerField(min_value=1, widget=forms.NumberInput(attrs={'class': 'form-control', 'min': '1'}))
     notes = forms.CharField(required=False, widget=forms.Textarea(attrs={'class': 'form-control', 'rows': 2, 'placeholder': 'Optional notes'}))
 
@@ -66,20 +61,21 @@ class TransactionForm(forms.ModelForm):
         quantity = cleaned_data.get('quantity')
 
         if category and quantity:
-            try:
-                # Check if enough stock
-                stock = Stock.objects.get(category=category)
-                if stock.quantity < quantity:
-                    raise ValidationError(f"Insufficient stock. Available: {stock.quantity} crates")
-
-                # Get current price
-                price = Price.objects.get(category=category)
-                cleaned_data['price_per_unit'] = price.price
-
-            except Stock.DoesNotExist:
+            # Fetch stock level and current price in one query
+            stock = Stock.objects.filter(category=category).annotate(
+                current_price=Subquery(
+                    Price.objects.filter(category=OuterRef('category')).values('price')[:1]
+                )
+            ).values('quantity', 'current_price').first()
+            if stock is None:
                 raise ValidationError(f"No stock record found for {category}")
-            except Price.DoesNotExist:
+            if stock['quantity'] < quantity:
+                raise ValidationError(f"Insufficient stock. Available: {stock['quantity']} crates")
+
+            price = stock['current_price']
+            if price is None:
                 raise ValidationError(f"No price set for {category}")
+            cleaned_data['price_per_unit'] = price
 
         return cleaned_data
 
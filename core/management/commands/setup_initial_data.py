@@ -27,15 +27,11 @@ class Command(BaseCommand):
             ('LARGE', 1800),   # Large eggs price
         ]
 
-        for category, price in categories:
-            price_obj, created = Price.objects.get_or_create(
-                category=category,
-                defaults={'price': price}
-            )
-            if created:
-                self.stdout.write(f'Created price for {category}: ₦{price}')
-            else:
-                self.stdout.write(f'Price for {category} already exists: ₦{price_obj.price}')
+        # ignore_conflicts skips rows that already exist, so this only ensures they are there
+        Price.objects.bulk_create(
+            [Price(category=category, price=price) for category, price in categories],
+            ignore_conflicts=True
+        )
 
         # Create initial stock records
         categories_stock = [
@@ -44,14 +40,12 @@ class Command(BaseCommand):
             ('LARGE', 0),
         ]
 
-        for category, quantity in categories_stock:
-            stock, created = Stock.objects.get_or_create(
-                category=category,
-                defaults={'quantity': quantity}
-            )
-            if created:
-                self.stdout.write(f'Created stock record for {category}')
-            else:
-                self.stdout.write(f'Stock for {category} already exists: {stock.quantity}')
+        Stock.objects.bulk_create(
+            [Stock(category=category, quantity=quantity) for category, quantity in categories_stock],
+            ignore_conflicts=True
+        )
+        self.stdout.write(
+            f'Ensured {len(categories)} price records and {len(categories_stock)} stock records'
+        )
 
         self.stdout.write(self.style.SUCCESS('Initial setup completed successfully'))
\ No newline at end of file
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:46
+
+from datetime import datetime
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    """Start each day's sequence after the highest invoice suffix already issued"""
+    Transaction = apps.get_model('core', 'Transaction')
+    DailyCounter = apps.get_model('core', 'DailyCounter')
+    highest = {}
+    invoices = Transaction.objects.filter(
+        invoice_number__startswith='INV-'
+    ).values_list('invoice_number', flat=True)
+    for invoice_number in invoices.iterator():
+        try:
+            _, date_str, suffix = invoice_number.split('-')
+            day = datetime.strptime(date_str, '%Y%m%d').date()
+            sequence = int(suffix)
+        except ValueError:
+            continue
+        highest[day] = max(highest.get(day, 0), sequence)
+    DailyCounter.objects.bulk_create([
+        DailyCounter(date=day, value=value) for day, value in highest.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('value', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_dailycounter'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='full_name',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='phone_number',
+            field=models.CharField(db_index=True, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-timestamp'], name='auditlog_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['action', '-timestamp'], name='auditlog_action_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockrecord',
+            index=models.Index(fields=['-date_recorded', 'category'], name='stockrecord_date_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['egg_category', '-transaction_date'], name='tx_cat_date_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_add_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['model_name', '-timestamp'], name='auditlog_model_ts_idx'),
+        ),
+    ]
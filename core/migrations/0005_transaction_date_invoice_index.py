@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_auditlog_model_ts_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['-transaction_date', 'invoice_number'], name='tx_date_inv_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:54
+
+from django.db import migrations
+
+# Columns searched with icontains in the customer and transaction list views.
+# On PostgreSQL icontains compiles to UPPER("col"::text) LIKE UPPER(%s), so the
+# index has to be on that expression for the planner to use it.
+TRIGRAM_INDEXES = [
+    ('customer_full_name_upper_trgm', 'core_customer', 'full_name'),
+    ('customer_nickname_upper_trgm', 'core_customer', 'nickname'),
+    ('customer_phone_upper_trgm', 'core_customer', 'phone_number'),
+    ('tx_invoice_number_upper_trgm', 'core_transaction', 'invoice_number'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm is PostgreSQL-only; other backends keep the plain B-tree indexes
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_transaction_date_invoice_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# Indexes from the first version of 0006, built on the raw columns. icontains
+# compiles to UPPER("col"::text) LIKE UPPER(%s), which they could not serve.
+RAW_COLUMN_INDEXES = [
+    'customer_full_name_trgm',
+    'customer_nickname_trgm',
+    'tx_invoice_number_trgm',
+]
+
+# Every column the customer and transaction list views search with icontains
+UPPER_TRIGRAM_INDEXES = [
+    ('customer_full_name_upper_trgm', 'core_customer', 'full_name'),
+    ('customer_nickname_upper_trgm', 'core_customer', 'nickname'),
+    ('customer_phone_upper_trgm', 'core_customer', 'phone_number'),
+    ('tx_invoice_number_upper_trgm', 'core_transaction', 'invoice_number'),
+]
+
+
+def rebuild_trigram_indexes(apps, schema_editor):
+    """Replace raw-column trigram indexes on databases that applied the old 0006"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name in RAW_COLUMN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+    for name, table, column in UPPER_TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_auditlog_timestamp_default'),
+    ]
+
+    operations = [
+        # 0006 drops the UPPER() indexes on reverse, so there is nothing to undo here
+        migrations.RunPython(rebuild_trigram_indexes, migrations.RunPython.noop),
+    ]
@@ -1,18 +1,62 @@
-from django.db import models
+from django.db import models, transaction as db_transaction
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.cache import cache
 from django.utils import timezone
 from django.db.models import Sum, F
 import logging
 
 logger = logging.getLogger(__name__)
 
+PRICE_CACHE_TIMEOUT = 300
+
+def price_cache_key(category):
+    return f'price:{category}'
+
+def get_current_price(category):
+    """Return the current unit price for a category, or None if no price is set"""
+    return cache.get_or_set(
+        price_cache_key(category),
+        lambda: Price.objects.filter(category=category).values_list('price', flat=True).first(),
+        PRICE_CACHE_TIMEOUT
+    )
+
+# Writes bump the version once committed, but without a shared CACHES backend
+# each worker has its own LocMemCache and only sees its own bumps, so keep the
+# TTL short to bound how stale another worker's copy can get
+DASHBOARD_CACHE_TIMEOUT = 30
+DASHBOARD_VERSION_KEY = 'dashboard:version'
+
+def dashboard_cache_key():
+    """Cache key for the current version of the dashboard context"""
+    version = cache.get_or_set(DASHBOARD_VERSION_KEY, 1, None)
+    # Include the date so "today" figures roll over at midnight
+    return f'dashboard:{version}:{timezone.now().date().isoformat()}'
+
+def invalidate_dashboard_cache():
+    """Bump the dashboard version so cached contexts are no longer read"""
+    cache.add(DASHBOARD_VERSION_KEY, 1, None)
+    cache.incr(DASHBOARD_VERSION_KEY)
+
+# Totals for days that have ended rarely change, but an edit in one worker only
+# clears that worker's LocMemCache, so the TTL bounds staleness elsewhere
+DAILY_SALES_CACHE_TIMEOUT = 60 * 5
+
+def daily_sales_cache_key(date):
+    return f'sales:{date.isoformat()}'
+
+class EggCategory(models.TextChoices):
+    """Egg categories shared by prices, stock and transactions"""
+    SMALL = 'SMALL', 'Small Eggs'
+    MEDIUM = 'MEDIUM', 'Medium Eggs'
+    LARGE = 'LARGE', 'Large Eggs'
+
 class Customer(models.Model):
     """Customer model for Kalories Kuisine"""
-    full_name = models.CharField(max_length=200)
+    full_name = models.CharField(max_length=200, db_index=True)
     nickname = models.CharField(max_length=100)
     address = models.TextField()
-    phone_number = models.CharField(max_length=20)
+    phone_number = models.CharField(max_length=20, db_index=True)
     date_created = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -24,19 +68,16 @@ class Customer(models.Model):
 
     def total_purchases(self):
         """Calculate total purchases for this customer"""
+        # Querysets annotated with _total_purchases avoid one aggregate per customer
+        if hasattr(self, '_total_purchases'):
+            return self._total_purchases or 0
         return self.transaction_set.aggregate(
             total=models.Sum('total_amount')
         )['total'] or 0
 
 class Price(models.Model):
     """Price management for egg categories"""
-    CATEGORY_CHOICES = [
-        ('SMALL', 'Small Eggs'),
-        ('MEDIUM', 'Medium Eggs'),
-        ('LARGE', 'Large Eggs'),
-    ]
-
-    category = models.CharField(max_length=10, choices=CATEGORY_CHOICES, unique=True)
+    category = models.CharField(max_length=10, choices=EggCategory.choices, unique=True)
     price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     date_updated = models.DateTimeField(auto_now=True)
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
@@ -47,30 +88,38 @@ class Price(models.Model):
     def __str__(self):
         return f"{self.get_category_display()} - ₦{self.price}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored price so save() can log changes without re-reading the row
+        instance._loaded_price = instance.__dict__.get('price')
+        return instance
+
     def save(self, *args, **kwargs):
         """Log price changes"""
-        if self.pk:
-            try:
-                old = Price.objects.get(pk=self.pk)
-                if old.price != self.price:
-                    logger.info(f"Price changed for {self.category}: {old.price} -> {self.price}")
-            except Price.DoesNotExist:
-                pass
+        loaded_price = getattr(self, '_loaded_price', None)
+        if loaded_price is not None and loaded_price != self.price:
+            logger.info(f"Price changed for {self.category}: {loaded_price} -> {self.price}")
+        # auto_now fields are only written when listed in update_fields
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'date_updated'}
         super().save(*args, **kwargs)
+        self._loaded_price = self.price
+
+class StockManager(models.Manager):
+    def low_stock(self):
+        """Stock rows below their alert threshold"""
+        return self.filter(quantity__lt=F('low_stock_threshold'))
 
 class Stock(models.Model):
     """Current stock levels"""
-    CATEGORY_CHOICES = [
-        ('SMALL', 'Small Eggs'),
-        ('MEDIUM', 'Medium Eggs'),
-        ('LARGE', 'Large Eggs'),
-    ]
-
-    category = models.CharField(max_length=10, choices=CATEGORY_CHOICES, unique=True)
+    category = models.CharField(max_length=10, choices=EggCategory.choices, unique=True)
     quantity = models.PositiveIntegerField(default=0, validators=[MinValueValidator(0)])
     last_updated = models.DateTimeField(auto_now=True)
     low_stock_threshold = models.PositiveIntegerField(default=50, help_text="Alert when stock below this")
 
+    objects = StockManager()
+
     def __str__(self):
         return f"{self.get_category_display()}: {self.quantity} crates"
 
@@ -80,9 +129,12 @@ class Stock(models.Model):
 
     def add_stock(self, quantity, user, notes=""):
         """Add stock and create record"""
-        self.quantity = F('quantity') + quantity
-        self.save()
-        self.refresh_from_db()
+        Stock.objects.filter(pk=self.pk).update(
+            quantity=F('quantity') + quantity,
+            last_updated=timezone.now()
+        )
+        self.quantity += quantity
+        db_transaction.on_commit(invalidate_dashboard_cache)
 
         # Create stock record
         StockRecord.objects.create(
@@ -95,23 +147,21 @@ class Stock(models.Model):
 
     def remove_stock(self, quantity, user, transaction):
         """Remove stock for a transaction"""
-        if self.quantity < quantity:
-            raise ValueError(f"Insufficient stock. Available: {self.quantity}, Requested: {quantity}")
-
-        self.quantity = F('quantity') - quantity
-        self.save()
-        self.refresh_from_db()
+        # Conditional update so the check and the decrement happen in one statement
+        updated = Stock.objects.filter(pk=self.pk, quantity__gte=quantity).update(
+            quantity=F('quantity') - quantity,
+            last_updated=timezone.now()
+        )
+        if not updated:
+            available = Stock.objects.filter(pk=self.pk).values_list('quantity', flat=True).first()
+            raise ValueError(f"Insufficient stock. Available: {available or 0}, Requested: {quantity}")
+        self.quantity -= quantity
+        db_transaction.on_commit(invalidate_dashboard_cache)
 
 class StockRecord(models.Model):
     """History of stock additions"""
-    CATEGORY_CHOICES = [
-        ('SMALL', 'Small Eggs'),
-        ('MEDIUM', 'Medium Eggs'),
-        ('LARGE', 'Large Eggs'),
-    ]
-
     stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='records')
-    category = models.CharField(max_length=10, choices=CATEGORY_CHOICES)
+    category = models.CharField(max_length=10, choices=EggCategory.choices)
     quantity_added = models.PositiveIntegerField()
     date_recorded = models.DateTimeField(auto_now_add=True)
     recorded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
@@ -119,20 +169,34 @@ class StockRecord(models.Model):
 
     class Meta:
         ordering = ['-date_recorded']
+        indexes = [
+            models.Index(fields=['-date_recorded', 'category'], name='stockrecord_date_cat_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_category_display()}: +{self.quantity_added} on {self.date_recorded.date()}"
 
+class DailyCounter(models.Model):
+    """Per-day invoice number sequence"""
+    date = models.DateField(unique=True)
+    value = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.date}: {self.value}"
+
+    @classmethod
+    def next_value(cls, date):
+        """Atomically increment and return the counter for the given date"""
+        with db_transaction.atomic():
+            counter, _ = cls.objects.select_for_update().get_or_create(date=date)
+            cls.objects.filter(pk=counter.pk).update(value=F('value') + 1)
+            counter.refresh_from_db(fields=['value'])
+        return counter.value
+
 class Transaction(models.Model):
     """Sales transactions"""
-    CATEGORY_CHOICES = [
-        ('SMALL', 'Small Eggs'),
-        ('MEDIUM', 'Medium Eggs'),
-        ('LARGE', 'Large Eggs'),
-    ]
-
     customer = models.ForeignKey(Customer, on_delete=models.PROTECT)
-    egg_category = models.CharField(max_length=10, choices=CATEGORY_CHOICES)
+    egg_category = models.CharField(max_length=10, choices=EggCategory.choices)
     quantity = models.PositiveIntegerField(validators=[MinValueValidator(1)])
     price_per_unit = models.DecimalField(max_digits=10, decimal_places=2)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, editable=False)
@@ -142,28 +206,31 @@ class Transaction(models.Model):
 
     class Meta:
         ordering = ['-transaction_date']
+        indexes = [
+            models.Index(fields=['-transaction_date', 'invoice_number'], name='tx_date_inv_idx'),
+            models.Index(fields=['egg_category', '-transaction_date'], name='tx_cat_date_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # Calculate total amount
         self.total_amount = self.quantity * self.price_per_unit
 
-        # Generate invoice number if not set
-        if not self.invoice_number:
-            date_str = timezone.now().strftime('%Y%m%d')
-            last_today = Transaction.objects.filter(
-                transaction_date__date=timezone.now().date()
-            ).count()
-            self.invoice_number = f"INV-{date_str}-{last_today + 1:04d}"
-
-        # Update stock
-        if not self.pk:  # Only on creation
-            try:
-                stock = Stock.objects.get(category=self.egg_category)
-                stock.remove_stock(self.quantity, self.recorded_by, self)
-            except Stock.DoesNotExist:
-                raise ValueError(f"No stock record found for {self.get_egg_category_display()}")
+        with db_transaction.atomic():
+            # Generate invoice number if not set
+            if not self.invoice_number:
+                now = timezone.now()
+                sequence = DailyCounter.next_value(now.date())
+                self.invoice_number = f"INV-{now.strftime('%Y%m%d')}-{sequence:04d}"
 
-        super().save(*args, **kwargs)
+            # Update stock
+            if not self.pk:  # Only on creation
+                try:
+                    stock = Stock.objects.get(category=self.egg_category)
+                    stock.remove_stock(self.quantity, self.recorded_by, self)
+                except Stock.DoesNotExist:
+                    raise ValueError(f"No stock record found for {self.get_egg_category_display()}")
+
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.invoice_number} - {self.customer} - ₦{self.total_amount}"
@@ -183,11 +250,17 @@ class AuditLog(models.Model):
     model_name = models.CharField(max_length=50)
     object_id = models.PositiveIntegerField(null=True, blank=True)
     details = models.JSONField(default=dict)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is built, not when the background writer inserts it
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp'], name='auditlog_ts_idx'),
+            models.Index(fields=['action', '-timestamp'], name='auditlog_action_ts_idx'),
+            models.Index(fields=['model_name', '-timestamp'], name='auditlog_model_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.timestamp} - {self.user} - {self.action}"
\ No newline at end of file
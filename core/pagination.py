@@ -0,0 +1,47 @@
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses PostgreSQL's row estimate instead of COUNT(*) for unfiltered lists"""
+
+    # Below this many rows an exact count is cheap and keeps the page range exact
+    exact_count_threshold = 10000
+    _estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        if estimate is None or estimate < self.exact_count_threshold:
+            return super().count
+        self._estimated = True
+        return estimate
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self._estimated:
+                raise
+        # reltuples can lag behind the table, so recount before rejecting the page
+        self._estimated = False
+        self.__dict__.pop('num_pages', None)
+        self.count = Paginator.count.func(self)
+        return super().validate_number(number)
+
+    def _estimated_count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None or query.where:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
@@ -0,0 +1,35 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import (
+    Customer, Price, Stock, Transaction,
+    daily_sales_cache_key, invalidate_dashboard_cache, price_cache_key
+)
+
+
+@receiver([post_save, post_delete], sender=Price)
+def invalidate_price_cache(sender, instance, **kwargs):
+    """Drop the cached price so the next lookup reads the new value"""
+    # Defer until commit so a concurrent lookup can't re-cache the old price
+    key = price_cache_key(instance.category)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver([post_save, post_delete], sender=Transaction)
+def invalidate_dashboard(sender, instance, **kwargs):
+    """New or removed sales change every dashboard figure"""
+    # Defer until commit so a concurrent request can't re-cache the old figures
+    transaction.on_commit(invalidate_dashboard_cache)
+    if instance.transaction_date:
+        key = daily_sales_cache_key(timezone.localdate(instance.transaction_date))
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver([post_save, post_delete], sender=Stock)
+@receiver([post_save, post_delete], sender=Customer)
+def invalidate_dashboard_counts(sender, **kwargs):
+    """Stock levels, customer counts and names also appear on the dashboard"""
+    transaction.on_commit(invalidate_dashboard_cache)
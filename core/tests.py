@@ -1,3 +1,202 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.paginator import EmptyPage
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .audit import AuditBufferMiddleware, AuditWriter, log_audit
+from .models import AuditLog, Customer, DailyCounter, Price, Stock, Transaction, get_current_price
+from .pagination import EstimatedCountPaginator
+
+
+class InvoiceNumberTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='clerk', password='secret')
+        self.customer = Customer.objects.create(
+            full_name='Ada Obi', nickname='Ada', address='1 Market Road', phone_number='08000000000'
+        )
+        self.stock = Stock.objects.create(category='SMALL', quantity=10)
+
+    def sell(self, quantity):
+        transaction = Transaction(
+            customer=self.customer,
+            egg_category='SMALL',
+            quantity=quantity,
+            price_per_unit=Decimal('1200'),
+            recorded_by=self.user,
+        )
+        transaction.save()
+        return transaction
+
+    def test_invoice_numbers_are_sequential_per_day(self):
+        prefix = f"INV-{timezone.now().strftime('%Y%m%d')}"
+        first = self.sell(1)
+        second = self.sell(1)
+        self.assertEqual(first.invoice_number, f'{prefix}-0001')
+        self.assertEqual(second.invoice_number, f'{prefix}-0002')
+
+    def test_insufficient_stock_rolls_back_counter(self):
+        self.sell(1)
+        counter = DailyCounter.objects.get(date=timezone.now().date())
+        with self.assertRaises(ValueError):
+            self.sell(100)
+        counter.refresh_from_db()
+        self.assertEqual(counter.value, 1)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+
+class StockTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='clerk', password='secret')
+        self.stock = Stock.objects.create(category='MEDIUM', quantity=5)
+
+    def test_remove_stock_decrements_without_reload(self):
+        self.stock.remove_stock(3, self.user, None)
+        self.assertEqual(self.stock.quantity, 2)
+        self.assertEqual(Stock.objects.get(pk=self.stock.pk).quantity, 2)
+
+    def test_remove_stock_refuses_to_go_negative(self):
+        with self.assertRaisesMessage(ValueError, 'Available: 5, Requested: 6'):
+            self.stock.remove_stock(6, self.user, None)
+        self.assertEqual(self.stock.quantity, 5)
+        self.assertEqual(Stock.objects.get(pk=self.stock.pk).quantity, 5)
+
+
+class PriceCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.price = Price.objects.create(category='LARGE', price=Decimal('1800'))
+
+    def test_saving_price_clears_cached_value(self):
+        self.assertEqual(get_current_price('LARGE'), Decimal('1800'))
+        with self.assertNumQueries(0):
+            get_current_price('LARGE')
+        self.price.price = Decimal('2000')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.price.save()
+        self.assertEqual(get_current_price('LARGE'), Decimal('2000'))
+
+
+# _write closes the thread's connection when done, which would break the test transaction
+@mock.patch('core.audit.connection')
+class AuditWriterTests(TestCase):
+    def setUp(self):
+        self.writer = AuditWriter()
+        self.writer.retry_delay = 0
+
+    def entries(self, count):
+        return [AuditLog(action='LOGIN', model_name='User') for _ in range(count)]
+
+    def test_bulk_insert_is_retried_after_a_failure(self, connection):
+        real_bulk_create = AuditLog.objects.bulk_create
+        outcomes = [OperationalError('database is locked')]
+
+        def flaky_bulk_create(*args, **kwargs):
+            if outcomes:
+                raise outcomes.pop()
+            return real_bulk_create(*args, **kwargs)
+
+        with mock.patch.object(AuditLog.objects, 'bulk_create', side_effect=flaky_bulk_create) as bulk_create, \
+                mock.patch.object(AuditLog, 'save') as save:
+            self.writer._write(self.entries(3))
+        self.assertEqual(bulk_create.call_count, 2)
+        save.assert_not_called()
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    def test_entries_are_saved_one_by_one_when_bulk_insert_keeps_failing(self, connection):
+        with mock.patch.object(
+            AuditLog.objects, 'bulk_create', side_effect=OperationalError('database is locked')
+        ) as bulk_create, self.assertLogs('core.audit', 'WARNING'):
+            self.writer._write(self.entries(3))
+        self.assertEqual(bulk_create.call_count, self.writer.max_attempts)
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    def test_stop_writes_queued_entries_in_one_batch(self, connection):
+        entries = self.entries(3)
+        with mock.patch.object(self.writer, '_write') as write:
+            self.writer.submit(entries)
+            self.writer.stop()
+        self.assertFalse(self.writer._thread.is_alive())
+        write.assert_called_once_with(entries)
+
+
+class AuditBufferTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_middleware_submits_buffered_entries(self):
+        def view(request):
+            log_audit(request, action='LOGOUT', model_name='User')
+            return HttpResponse()
+
+        with mock.patch('core.audit.audit_writer.submit') as submit:
+            AuditBufferMiddleware(view)(self.factory.get('/'))
+        (entries,), _ = submit.call_args
+        self.assertEqual([entry.action for entry in entries], ['LOGOUT'])
+        self.assertEqual(AuditLog.objects.count(), 0)
+
+    def test_log_audit_saves_directly_without_buffer(self):
+        log_audit(self.factory.get('/'), action='LOGIN', model_name='User')
+        self.assertEqual(AuditLog.objects.get().action, 'LOGIN')
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        Customer.objects.bulk_create([
+            Customer(full_name=f'Customer {i}', nickname='', address='', phone_number=str(i))
+            for i in range(5)
+        ])
+        self.paginator = EstimatedCountPaginator(Customer.objects.order_by('pk'), 1)
+        # Treat the table as large enough to trust a stale, low row estimate
+        self.paginator.exact_count_threshold = 2
+        patcher = mock.patch.object(self.paginator, '_estimated_count', return_value=3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_page_past_estimate_is_recounted_and_served(self):
+        self.assertEqual(self.paginator.num_pages, 3)
+        page = self.paginator.page(5)
+        self.assertEqual(page.number, 5)
+        self.assertEqual(self.paginator.count, 5)
+        self.assertEqual(self.paginator.num_pages, 5)
+
+    def test_page_past_real_count_is_still_empty(self):
+        with self.assertRaises(EmptyPage):
+            self.paginator.page(6)
+        self.assertEqual(self.paginator.count, 5)
+
+
+class StockListETagTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='clerk', password='secret')
+        self.client.force_login(self.user)
+        self.stock = Stock.objects.create(category='SMALL', quantity=5)
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(reverse('stock_list'))['ETag']
+        response = self.client.get(reverse('stock_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_after_adding_stock(self):
+        etag = self.client.get(reverse('stock_list'))['ETag']
+        self.stock.add_stock(2, self.user)
+        response = self.client.get(reverse('stock_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_no_etag_while_flash_message_is_pending(self):
+        etag = self.client.get(reverse('stock_list'))['ETag']
+        response = self.client.post(reverse('add_stock'), {'category': 'SMALL', 'quantity': 1})
+        self.assertRedirects(response, reverse('stock_list'), fetch_redirect_response=False)
+        response = self.client.get(reverse('stock_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertContains(response, 'Added 1 crates to Small Eggs')
+        # Once the message has been shown the page is cacheable again
+        self.assertTrue(self.client.get(reverse('stock_list')).has_header('ETag'))
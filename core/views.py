@@ -2,10 +2,14 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib import messages
-from django.db.models import Sum, Count, Q, Avg  # Make sure Avg is here
+from django.db.models import Sum, Count, Q, Avg, Max  # Make sure Avg is here
+from django.db.models.functions import TruncDate
 from django.utils import timezone
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.core.paginator import Paginator
+from django.core.cache import cache
+from django.db import connection
+from django.views.decorators.http import etag
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -13,7 +17,13 @@ import csv
 from datetime import datetime, timedelta
 import json
 
-from .models import Customer, Price, Stock, StockRecord, Transaction, AuditLog
+from .models import (
+    Customer, Price, Stock, StockRecord, Transaction, AuditLog, EggCategory,
+    get_current_price, dashboard_cache_key, daily_sales_cache_key,
+    DASHBOARD_CACHE_TIMEOUT, DAILY_SALES_CACHE_TIMEOUT
+)
+from .audit import log_audit
+from .pagination import EstimatedCountPaginator
 from .forms import (
     LoginForm, CustomerForm, PriceForm, 
     StockRecordForm, TransactionForm, DateRangeForm, SearchForm
@@ -32,7 +42,8 @@ def login_view(request):
             if user is not None:
                 login(request, user)
                 # Create audit log
-                AuditLog.objects.create(
+                log_audit(
+                    request,
                     user=user,
                     action='LOGIN',
                     model_name='User',
@@ -49,7 +60,8 @@ def login_view(request):
 
 @login_required
 def logout_view(request):
-    AuditLog.objects.create(
+    log_audit(
+        request,
         user=request.user,
         action='LOGOUT',
         model_name='User',
@@ -60,48 +72,66 @@ def logout_view(request):
     return redirect('login')
 
 # Dashboard View
-@login_required
-def dashboard(request):
+def _build_dashboard_context():
     # Get summary statistics
     total_customers = Customer.objects.count()
     
     # Get stock totals
-    stocks = Stock.objects.all()
-    stock_data = {stock.category: stock.quantity for stock in stocks}
+    stock_data = dict(Stock.objects.values_list('category', 'quantity'))
     
-    # Get total transactions and revenue
-    transactions = Transaction.objects.all()
-    total_transactions = transactions.count()
-    total_revenue = transactions.aggregate(Sum('total_amount'))['total_amount__sum'] or 0
-
-    # Get today's transactions
+    # Get total and today's transactions and revenue in one query
     today = timezone.now().date()
-    today_transactions = transactions.filter(transaction_date__date=today)
-    today_revenue = today_transactions.aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    totals = Transaction.objects.aggregate(
+        total_transactions=Count('id'),
+        total_revenue=Sum('total_amount'),
+        today_revenue=Sum('total_amount', filter=Q(transaction_date__date=today)),
+    )
+    total_transactions = totals['total_transactions']
+    total_revenue = totals['total_revenue'] or 0
+    today_revenue = totals['today_revenue'] or 0
 
     # Check low stock alerts
-    low_stock_alerts = [stock for stock in stocks if stock.is_low_stock()]
+    low_stock_alerts = list(Stock.objects.low_stock())
 
     # Get recent transactions
-    recent_transactions = transactions[:10]
+    recent_transactions = list(Transaction.objects.select_related('customer')[:10])
 
     # Get top customers
-    top_customers = Customer.objects.annotate(
+    top_customers = list(Customer.objects.only('full_name', 'nickname').annotate(
         total_spent=Sum('transaction__total_amount')
-    ).order_by('-total_spent')[:5]
+    ).order_by('-total_spent')[:5])
+
+    # Prepare chart data: closed days come from cache, today from the totals above
+    past_days = [today - timedelta(days=i) for i in range(6, 0, -1)]
+    cached = cache.get_many([daily_sales_cache_key(day) for day in past_days])
+    sales_by_day = {
+        day: cached[daily_sales_cache_key(day)]
+        for day in past_days if daily_sales_cache_key(day) in cached
+    }
+    missing = [day for day in past_days if day not in sales_by_day]
+    if missing:
+        daily_totals = Transaction.objects.filter(
+            transaction_date__date__range=(missing[0], missing[-1])
+        ).values(day=TruncDate('transaction_date')).annotate(
+            total=Sum('total_amount')
+        ).order_by()
+        fetched = {row['day']: row['total'] or 0 for row in daily_totals}
+        for day in missing:
+            sales_by_day[day] = fetched.get(day, 0)
+        cache.set_many(
+            {daily_sales_cache_key(day): sales_by_day[day] for day in missing},
+            DAILY_SALES_CACHE_TIMEOUT
+        )
+    sales_by_day[today] = today_revenue
 
-    # Prepare chart data
     last_7_days = []
     sales_data = []
     for i in range(6, -1, -1):
         date = today - timedelta(days=i)
-        daily_total = Transaction.objects.filter(
-            transaction_date__date=date
-        ).aggregate(Sum('total_amount'))['total_amount__sum'] or 0
         last_7_days.append(date.strftime('%Y-%m-%d'))
-        sales_data.append(float(daily_total))
+        sales_data.append(float(sales_by_day.get(date, 0)))
 
-    context = {
+    return {
         'total_customers': total_customers,
         'stock_small': stock_data.get('SMALL', 0),
         'stock_medium': stock_data.get('MEDIUM', 0),
@@ -115,6 +145,17 @@ def dashboard(request):
         'chart_labels': json.dumps(last_7_days),
         'chart_data': json.dumps(sales_data),
     }
+
+@login_required
+def dashboard(request):
+    # The dashboard shows the same figures to every user, so one cached copy
+    # is shared until a committed transaction, stock or customer change bumps
+    # the version or DASHBOARD_CACHE_TIMEOUT expires
+    key = dashboard_cache_key()
+    context = cache.get(key)
+    if context is None:
+        context = _build_dashboard_context()
+        cache.set(key, context, DASHBOARD_CACHE_TIMEOUT)
     return render(request, 'core/dashboard.html', context)
 
 # Customer Views
@@ -123,10 +164,19 @@ class CustomerListView(LoginRequiredMixin, ListView):
     template_name = 'core/customer_list.html'
     context_object_name = 'customers'
     paginate_by = 20
+    paginator_class = EstimatedCountPaginator
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        # Validate the filter form once and share it with get_queryset and the template
+        self.search_form = SearchForm(request.GET)
+        self.search_form.is_valid()
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        search_query = self.request.GET.get('search', '')
+        queryset = super().get_queryset().only(
+            'full_name', 'nickname', 'phone_number', 'address', 'date_created'
+        )
+        search_query = self.search_form.cleaned_data.get('query')
         if search_query:
             queryset = queryset.filter(
                 Q(full_name__icontains=search_query) |
@@ -137,7 +187,7 @@ class CustomerListView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['search_form'] = SearchForm(self.request.GET)
+        context['search_form'] = self.search_form
         return context
 
 class CustomerCreateView(LoginRequiredMixin, CreateView):
@@ -171,18 +221,48 @@ class CustomerDeleteView(LoginRequiredMixin, DeleteView):
 
 @login_required
 def customer_detail(request, pk):
-    customer = get_object_or_404(Customer, pk=pk)
-    transactions = customer.transaction_set.all().order_by('-transaction_date')
-    
+    customer = get_object_or_404(
+        Customer.objects.only(
+            'full_name', 'nickname', 'phone_number', 'address', 'date_created'
+        ).annotate(_total_purchases=Sum('transaction__total_amount')),
+        pk=pk
+    )
+    transactions = customer.transaction_set.only(
+        'customer', 'transaction_date', 'invoice_number', 'egg_category',
+        'quantity', 'price_per_unit', 'total_amount'
+    ).order_by('-transaction_date')
+    page_obj = Paginator(transactions, 25).get_page(request.GET.get('page'))
+
     context = {
         'customer': customer,
-        'transactions': transactions,
+        'transactions': page_obj,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
         'total_spent': customer.total_purchases(),
     }
     return render(request, 'core/customer_detail.html', context)
 
+# Conditional GET helpers
+def _table_etag(request, model, timestamp_field, rows=Count('pk')):
+    """ETag from the newest timestamp and row count, so edits and deletes both change it
+
+    Append-only tables can pass rows=Max('pk') to avoid a COUNT(*).
+    """
+    # base.html consumes pending flash messages, which a 304 would never render
+    if len(messages.get_messages(request)):
+        return None
+    state = model.objects.aggregate(latest=Max(timestamp_field), rows=rows)
+    if state['latest'] is None:
+        return None
+    # Pages include the signed-in user's navbar, so keep tags per user
+    return f"{request.user.pk}-{state['latest'].timestamp()}-{state['rows']}"
+
 # Stock Views
+def _stock_etag(request):
+    return _table_etag(request, Stock, 'last_updated')
+
 @login_required
+@etag(_stock_etag)
 def stock_list(request):
     stocks = Stock.objects.all()
     return render(request, 'core/stock_list.html', {'stocks': stocks})
@@ -211,25 +291,36 @@ def add_stock(request):
 
 @login_required
 def stock_history(request):
-    records = StockRecord.objects.all().select_related('recorded_by')[:100]
-    return render(request, 'core/stock_history.html', {'records': records})
+    records = StockRecord.objects.select_related('recorded_by').only(
+        'category', 'quantity_added', 'date_recorded', 'notes', 'recorded_by__username'
+    )
+    page_obj = Paginator(records, 25).get_page(request.GET.get('page'))
+    return render(request, 'core/stock_history.html', {
+        'records': page_obj,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
+    })
 
 # Price Views
+def _prices_etag(request):
+    return _table_etag(request, Price, 'date_updated')
+
 @login_required
+@etag(_prices_etag)
 def price_list(request):
     prices = Price.objects.all()
     return render(request, 'core/price_list.html', {'prices': prices})
 
 @login_required
 def update_price(request, pk):
-    price = get_object_or_404(Price, pk=pk)
+    price = get_object_or_404(Price.objects.only('category', 'price', 'updated_by'), pk=pk)
 
     if request.method == 'POST':
         form = PriceForm(request.POST, instance=price)
         if form.is_valid():
             price = form.save(commit=False)
             price.updated_by = request.user
-            price.save()
+            price.save(update_fields=['price', 'updated_by'])
             messages.success(request, f'Price updated for {price.get_category_display()}')
             return redirect('price_list')
     else:
@@ -243,14 +334,26 @@ class TransactionListView(LoginRequiredMixin, ListView):
     template_name = 'core/transaction_list.html'
     context_object_name = 'transactions'
     paginate_by = 20
+    paginator_class = EstimatedCountPaginator
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        # Validate the filter forms once and share them with get_queryset and the template
+        self.date_form = DateRangeForm(request.GET)
+        self.search_form = SearchForm(request.GET)
+        self.date_form.is_valid()
+        self.search_form.is_valid()
 
     def get_queryset(self):
-        queryset = super().get_queryset().select_related('customer', 'recorded_by')
+        queryset = super().get_queryset().select_related('customer', 'recorded_by').only(
+            'invoice_number', 'transaction_date', 'egg_category', 'quantity',
+            'price_per_unit', 'total_amount', 'customer__full_name', 'recorded_by__username'
+        )
         
         # Filter by date range
-        start_date = self.request.GET.get('start_date')
-        end_date = self.request.GET.get('end_date')
-        
+        start_date = self.date_form.cleaned_data.get('start_date')
+        end_date = self.date_form.cleaned_data.get('end_date')
+
         if start_date:
             queryset = queryset.filter(transaction_date__date__gte=start_date)
         if end_date:
@@ -262,7 +365,7 @@ class TransactionListView(LoginRequiredMixin, ListView):
             queryset = queryset.filter(egg_category=category)
 
         # Search by customer
-        search = self.request.GET.get('search')
+        search = self.search_form.cleaned_data.get('query')
         if search:
             queryset = queryset.filter(
                 Q(customer__full_name__icontains=search) |
@@ -274,9 +377,9 @@ class TransactionListView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['date_form'] = DateRangeForm(self.request.GET)
-        context['search_form'] = SearchForm(self.request.GET)
-        context['categories'] = Transaction.CATEGORY_CHOICES
+        context['date_form'] = self.date_form
+        context['search_form'] = self.search_form
+        context['categories'] = EggCategory.choices
         return context
 
 @login_required
@@ -309,15 +412,24 @@ def create_transaction(request):
 def get_price(request):
     """AJAX view to get current price for a category"""
     category = request.GET.get('category')
-    try:
-        price = Price.objects.get(category=category)
-        return JsonResponse({'price': float(price.price)})
-    except Price.DoesNotExist:
+    # Only known categories reach the cache, so junk values can't evict real keys
+    if category not in EggCategory.values:
+        return JsonResponse({'error': 'Price not found'}, status=404)
+    price = get_current_price(category)
+    if price is None:
         return JsonResponse({'error': 'Price not found'}, status=404)
+    return JsonResponse({'price': float(price)})
 
 @login_required
 def transaction_invoice(request, pk):
-    transaction = get_object_or_404(Transaction, pk=pk)
+    transaction = get_object_or_404(
+        Transaction.objects.select_related('customer').only(
+            'invoice_number', 'transaction_date', 'egg_category', 'quantity',
+            'price_per_unit', 'total_amount', 'customer__full_name',
+            'customer__nickname', 'customer__phone_number', 'customer__address'
+        ),
+        pk=pk
+    )
     return render(request, 'core/invoice.html', {'transaction': transaction})
 
 # Reports Views
@@ -365,14 +477,13 @@ def reports(request):
     ).order_by('-total')[:10]
 
     # Summary statistics
-    summary = {
-        'total_sales': transactions.aggregate(Sum('total_amount'))['total_amount__sum'] or 0,
-        'total_transactions': transactions.count(),
-        'total_quantity': transactions.aggregate(Sum('quantity'))['quantity__sum'] or 0,
-        'average_transaction': transactions.aggregate(
-            avg=Avg('total_amount')  # Changed from models.Avg to Avg
-        )['avg'] or 0,
-    }
+    totals = transactions.aggregate(
+        total_sales=Sum('total_amount'),
+        total_transactions=Count('id'),
+        total_quantity=Sum('quantity'),
+        average_transaction=Avg('total_amount'),
+    )
+    summary = {key: value or 0 for key, value in totals.items()}
 
     context = {
         'form': form,
@@ -385,21 +496,27 @@ def reports(request):
     }
     return render(request, 'core/reports.html', context)
 
-@login_required
-def export_transactions(request):
-    # Create CSV response
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="transactions.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow([
-        'Invoice Number', 'Date', 'Customer', 'Category',
-        'Quantity', 'Price Per Unit', 'Total Amount', 'Recorded By'
-    ])
+class Echo:
+    """File-like object that returns each written row instead of buffering it"""
+    def write(self, value):
+        return value
+
+EXPORT_HEADER = [
+    'Invoice Number', 'Date', 'Customer', 'Category',
+    'Quantity', 'Price Per Unit', 'Total Amount', 'Recorded By'
+]
+
+def _export_rows_orm():
+    """Yield CSV lines for the transactions export through the ORM"""
+    writer = csv.writer(Echo())
+    transactions = Transaction.objects.select_related('customer', 'recorded_by').only(
+        'invoice_number', 'transaction_date', 'egg_category', 'quantity',
+        'price_per_unit', 'total_amount', 'customer__full_name', 'recorded_by__username'
+    )
 
-    transactions = Transaction.objects.select_related('customer', 'recorded_by').all()
-    for t in transactions:
-        writer.writerow([
+    yield writer.writerow(EXPORT_HEADER)
+    for t in transactions.iterator(chunk_size=2000):
+        yield writer.writerow([
             t.invoice_number,
             t.transaction_date.strftime('%Y-%m-%d %H:%M'),
             t.customer.full_name,
@@ -410,13 +527,65 @@ def export_transactions(request):
             t.recorded_by.username if t.recorded_by else 'Unknown'
         ])
 
+def _export_rows_copy():
+    """Yield CSV bytes for the transactions export straight from PostgreSQL's COPY"""
+    user_table = Transaction._meta.get_field('recorded_by').related_model._meta.db_table
+    categories = ' '.join(f"WHEN '{value}' THEN '{label}'" for value, label in EggCategory.choices)
+    columns = [
+        't.invoice_number',
+        "to_char(t.transaction_date AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI')",
+        'c.full_name',
+        f'CASE t.egg_category {categories} ELSE t.egg_category END',
+        't.quantity',
+        't.price_per_unit',
+        't.total_amount',
+        "COALESCE(u.username, 'Unknown')",
+    ]
+    select = ', '.join(f'{column} AS "{label}"' for column, label in zip(columns, EXPORT_HEADER))
+    sql = (
+        f'COPY (SELECT {select} '
+        f'FROM {Transaction._meta.db_table} t '
+        f'JOIN {Customer._meta.db_table} c ON c.id = t.customer_id '
+        f'LEFT JOIN {user_table} u ON u.id = t.recorded_by_id '
+        f'ORDER BY t.transaction_date DESC) TO STDOUT WITH CSV HEADER'
+    )
+    with connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            for data in copy:
+                yield bytes(data)
+
+def _can_copy_export():
+    if connection.vendor != 'postgresql':
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+    return is_psycopg3
+
+@login_required
+def export_transactions(request):
+    # On PostgreSQL with psycopg 3 the database formats the CSV itself;
+    # elsewhere rows are streamed through the ORM
+    rows = _export_rows_copy() if _can_copy_export() else _export_rows_orm()
+
+    # Stream rows as they are read so large exports don't sit in memory
+    response = StreamingHttpResponse(rows, content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="transactions.csv"'
     return response
 
 # Audit Log View
+def _audit_log_etag(request):
+    # Audit entries are only ever added, so the newest id stands in for the count
+    return _table_etag(request, AuditLog, 'timestamp', rows=Max('pk'))
+
 @login_required
+@etag(_audit_log_etag)
 def audit_log(request):
-    logs = AuditLog.objects.select_related('user').all()[:100]
-    return render(request, 'core/audit_log.html', {'logs': logs})
+    logs = AuditLog.objects.select_related('user').all()
+    page_obj = Paginator(logs, 25).get_page(request.GET.get('page'))
+    return render(request, 'core/audit_log.html', {
+        'logs': page_obj,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
+    })
 
 # Add this at the end of core/views.py
 def handler404(request, exception):